@@ -39,6 +39,7 @@ INSTALLED_APPS = [
 
 # Middleware stack
 MIDDLEWARE = [
+    'logapp.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -140,3 +141,6 @@ MESSAGE_TAGS = {
     messages.WARNING: 'warning',
     messages.ERROR: 'error',
 }
+
+# Bearer token required by /metrics; when unset the endpoint only exists in DEBUG
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
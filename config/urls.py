@@ -15,4 +15,5 @@ urlpatterns = [
     path('perfumes/add/', views.add_perfume, name='add_perfume'),
     path('perfumes/edit/<int:perfume_id>/', views.edit_perfume, name='edit_perfume'),
     path('perfumes/delete/<int:perfume_id>/', views.delete_perfume, name='delete_perfume'),
+    path('metrics', views.metrics, name='metrics'),
 ]
@@ -0,0 +1,28 @@
+"""
+Gunicorn configuration, picked up automatically from the working directory.
+
+Workers share Prometheus metrics through mmap'd files, so the directory is
+set here, before any worker imports prometheus_client.
+"""
+
+import glob
+import os
+import tempfile
+
+multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "scentspot-metrics"),
+)
+
+
+def on_starting(server):
+    # Drop samples left over from a previous run, leaving other files alone
+    for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+        os.remove(path)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LogappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'logapp'
+
+    def ready(self):
+        # Connect metric signal receivers
+        from . import metrics  # noqa: F401
@@ -0,0 +1,138 @@
+"""
+Prometheus metrics for the ScentSpot app.
+
+When PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py), every worker
+writes its samples to mmap'd files in that directory and /metrics merges
+them, so the endpoint reports the whole server no matter which worker
+answers the scrape.
+"""
+
+import os
+import sys
+import time
+
+from django.contrib.auth.signals import user_login_failed
+from django.dispatch import receiver
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Request metrics, labelled by the resolved URL name (e.g. "record_usage")
+REQUEST_LATENCY = Histogram(
+    'scentspot_request_duration_seconds',
+    'Time spent handling a request',
+    ['view', 'method'],
+)
+REQUESTS = Counter(
+    'scentspot_requests_total',
+    'Requests handled',
+    ['view', 'method', 'status'],
+)
+
+# Database metrics, one observation per request
+DB_TIME = Histogram(
+    'scentspot_db_time_seconds',
+    'Total database time spent per request',
+    ['view'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_QUERIES = Counter(
+    'scentspot_db_queries_total',
+    'Database queries executed',
+    ['view'],
+)
+
+# Business metrics
+SPRAYS_RECORDED = Counter(
+    'scentspot_sprays_recorded_total',
+    'Perfume usages recorded',
+)
+LOGIN_FAILURES = Counter(
+    'scentspot_login_failures_total',
+    'Failed login attempts',
+)
+
+# Worker metrics
+WORKER_MEMORY = Gauge(
+    'scentspot_worker_resident_memory_bytes',
+    'Resident memory of the worker process',
+    multiprocess_mode='liveall',
+)
+
+UNRESOLVED_VIEW = 'unresolved'
+
+# Methods reported as-is; anything else a client sends is lumped together
+KNOWN_METHODS = frozenset(
+    ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+)
+OTHER_METHOD = 'other'
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+class QueryTimer:
+    """Database execute wrapper that adds up query time for one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def method_label(method):
+    """Bound the method label to a fixed set of values"""
+    return method if method in KNOWN_METHODS else OTHER_METHOD
+
+
+def resident_memory_bytes():
+    """Current RSS of this process, or peak RSS where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if resource is None:
+        return 0
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def render_latest():
+    """Serialize all metrics in the Prometheus text format"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+@receiver(user_login_failed)
+def count_login_failure(sender, credentials, **kwargs):
+    LOGIN_FAILURES.inc()
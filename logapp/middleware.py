@@ -0,0 +1,45 @@
+import time
+
+from django.db import connection
+
+from .metrics import (
+    DB_QUERIES,
+    DB_TIME,
+    REQUEST_LATENCY,
+    REQUESTS,
+    UNRESOLVED_VIEW,
+    WORKER_MEMORY,
+    QueryTimer,
+    method_label,
+    resident_memory_bytes,
+)
+
+
+class MetricsMiddleware:
+    """Record latency, DB time and worker memory for every request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        query_timer = QueryTimer()
+        start = time.perf_counter()
+
+        with connection.execute_wrapper(query_timer):
+            response = self.get_response(request)
+
+        duration = time.perf_counter() - start
+
+        # Label by URL name so that path parameters don't explode cardinality
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else UNRESOLVED_VIEW
+        method = method_label(request.method)
+
+        REQUEST_LATENCY.labels(view, method).observe(duration)
+        REQUESTS.labels(view, method, response.status_code).inc()
+        DB_TIME.labels(view).observe(query_timer.duration)
+        if query_timer.count:
+            DB_QUERIES.labels(view).inc(query_timer.count)
+        WORKER_MEMORY.set(resident_memory_bytes())
+
+        return response
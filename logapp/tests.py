@@ -1,3 +1,129 @@
-from django.test import TestCase
+from django.contrib.auth.models import User as AuthUser
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
 
-# Create your tests here.
+from .models import Perfume
+
+
+def sample(name, **labels):
+    """Current value of a metric sample, 0 when it has not been recorded"""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class RequestMetricsTests(TestCase):
+    """Labels recorded by MetricsMiddleware"""
+
+    def setUp(self):
+        self.auth_user = AuthUser.objects.create_user('staff', password='secret')
+        self.client.force_login(self.auth_user)
+
+    def assertRequestCounted(self, view, method, status, action):
+        labels = {'view': view, 'method': method, 'status': str(status)}
+        before = sample('scentspot_requests_total', **labels)
+        action()
+        self.assertEqual(sample('scentspot_requests_total', **labels), before + 1)
+
+    def test_resolved_route(self):
+        self.assertRequestCounted('home', 'GET', 200, lambda: self.client.get('/'))
+
+    def test_parameterised_route_uses_url_name(self):
+        perfume = Perfume.objects.create(brand='Brand', name='Scent', capacity_ml=50)
+        self.assertRequestCounted(
+            'edit_perfume', 'GET', 302,
+            lambda: self.client.get(f'/perfumes/edit/{perfume.id}/'),
+        )
+
+    def test_unknown_route(self):
+        self.assertRequestCounted(
+            'unresolved', 'GET', 404, lambda: self.client.get('/does-not-exist/')
+        )
+
+    def test_unknown_methods_share_one_label(self):
+        before = sample('scentspot_requests_total', view='home', method='other', status='200')
+
+        self.client.generic('FOOBAR1', '/')
+        self.client.generic('FOOBAR2', '/')
+
+        self.assertEqual(
+            sample('scentspot_requests_total', view='home', method='other', status='200'),
+            before + 2,
+        )
+        self.assertIsNone(REGISTRY.get_sample_value(
+            'scentspot_requests_total',
+            {'view': 'home', 'method': 'FOOBAR1', 'status': '200'},
+        ))
+
+    def test_latency_and_db_time_observed(self):
+        latency_before = sample(
+            'scentspot_request_duration_seconds_count', view='all_logs', method='GET'
+        )
+        db_before = sample('scentspot_db_time_seconds_count', view='all_logs')
+
+        self.client.get('/logs/')
+
+        self.assertEqual(
+            sample('scentspot_request_duration_seconds_count', view='all_logs', method='GET'),
+            latency_before + 1,
+        )
+        self.assertEqual(
+            sample('scentspot_db_time_seconds_count', view='all_logs'), db_before + 1
+        )
+
+
+class MetricsEndpointTests(TestCase):
+    """Access control on /metrics"""
+
+    @override_settings(METRICS_TOKEN=None, DEBUG=False)
+    def test_hidden_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    @override_settings(METRICS_TOKEN=None, DEBUG=True)
+    def test_open_without_token_in_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_missing_token(self):
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer')
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_wrong_token(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(METRICS_TOKEN='s3cret')
+    def test_correct_token(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'scentspot_requests_total', response.content)
+
+
+class BusinessMetricsTests(TestCase):
+    """Login failures and recorded sprays"""
+
+    def test_failed_login_counted(self):
+        before = sample('scentspot_login_failures_total')
+
+        self.client.post('/login/', {'username': 'nobody', 'password': 'wrong'})
+
+        self.assertEqual(sample('scentspot_login_failures_total'), before + 1)
+
+    def test_recorded_spray_counted(self):
+        auth_user = AuthUser.objects.create_user('staff', password='secret')
+        self.client.force_login(auth_user)
+        perfume = Perfume.objects.create(brand='Brand', name='Scent', capacity_ml=50)
+        before = sample('scentspot_sprays_recorded_total')
+
+        self.client.post('/record/', {'perfume': perfume.id, 'gender': 'Female'})
+
+        self.assertEqual(sample('scentspot_sprays_recorded_total'), before + 1)
+
+    def test_invalid_spray_not_counted(self):
+        auth_user = AuthUser.objects.create_user('staff', password='secret')
+        self.client.force_login(auth_user)
+        before = sample('scentspot_sprays_recorded_total')
+
+        self.client.post('/record/', {'gender': 'Female'})
+
+        self.assertEqual(sample('scentspot_sprays_recorded_total'), before)
@@ -1,10 +1,15 @@
+import hmac
+
+from django.conf import settings
 from django.db.models import Count
+from django.http import Http404, HttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User as AuthUser
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from .metrics import SPRAYS_RECORDED, render_latest
 from .models import Perfume, User, UsageLog
 
 def login_view(request):
@@ -132,6 +137,7 @@ def record_usage(request):
                 perfume=perfume,
                 user=current_staff_user,  # 自動使用當前登入使用者
             )
+            SPRAYS_RECORDED.inc()
             
             messages.success(
                 request, 
@@ -282,4 +288,23 @@ def delete_perfume(request, perfume_id):
         except Exception as e:
             messages.error(request, f'Error deleting perfume: {str(e)}')
     
-    return redirect('perfume_management')
\ No newline at end of file
+    return redirect('perfume_management')
+
+
+def metrics(request):
+    """Prometheus 指標 - 需要 METRICS_TOKEN Bearer token (DEBUG 模式除外)"""
+    token = settings.METRICS_TOKEN
+    if not token:
+        # Fail closed: without a token the endpoint only exists in DEBUG
+        if not settings.DEBUG:
+            raise Http404
+    elif not hmac.compare_digest(
+        request.headers.get('Authorization', '').encode(),
+        f'Bearer {token}'.encode(),
+    ):
+        response = HttpResponse(status=401)
+        response['WWW-Authenticate'] = 'Bearer'
+        return response
+
+    body, content_type = render_latest()
+    return HttpResponse(body, content_type=content_type)